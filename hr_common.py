@@ -0,0 +1,77 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+import tempfile
+
+# 데이터 로드 (대시보드에서 쓰는 컬럼만 읽음)
+NEEDED = ["퇴직여부", "부서", "급여증가분백분율", "야근정도"]
+# NEEDED나 dtype을 바꾸면 올려서 이전 스키마의 Parquet 캐시를 재사용하지 않게 함
+PARQUET_VERSION = 2
+
+@st.cache_data
+def load_df(path="HR Data.csv"):
+    # CSV보다 빠른 Parquet 캐시가 최신이면 그대로 사용 (읽기 실패 시 CSV로 대체)
+    pq_path = f"{os.path.splitext(path)[0]}.v{PARQUET_VERSION}.parquet"
+    if os.path.exists(pq_path) and os.path.exists(path) \
+            and os.path.getmtime(pq_path) >= os.path.getmtime(path):
+        try:
+            return pd.read_parquet(pq_path, engine="pyarrow", columns=NEEDED + ["퇴직"])
+        except Exception:
+            pass
+    try:
+        df = pd.read_csv(path, encoding="utf-8", usecols=NEEDED,
+                         dtype={"퇴직여부":"category", "부서":"category", "야근정도":"category",
+                                "급여증가분백분율":"float32"})
+    except:
+        return pd.DataFrame()
+    # 범주형 코드끼리 정수 비교 (딕셔너리 매핑 없이 한 번에 계산)
+    df["퇴직"] = (df["퇴직여부"].array == "Yes").astype(np.int8)
+    _write_parquet(df, pq_path)
+    return df
+
+def _write_parquet(df, pq_path):
+    # 임시 파일에 쓴 뒤 교체해 중간에 끊겨도 잘린 캐시 파일이 남지 않게 함
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(pq_path) or ".")
+    except OSError:
+        return
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        os.replace(tmp_path, pq_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+# 집계 캐시 (DataFrame 해시는 shape/컬럼만 사용해 전체 행 스캔을 피함)
+_df_hash = {pd.DataFrame: lambda d: (d.shape, tuple(d.columns))}
+
+@st.cache_data(hash_funcs=_df_hash)
+def dept_rate(df):
+    return df.groupby("부서", observed=True, sort=False)["퇴직"].mean().mul(100).sort_values(ascending=False)
+
+@st.cache_data(hash_funcs=_df_hash)
+def salary_rate(df):
+    # 정수 단위 구간으로 범주화 (결측치는 구간 밖이라 groupby에서 자동 제외)
+    pct = df["급여증가분백분율"]
+    lo, hi = int(np.floor(pct.min())), int(np.ceil(pct.max()))
+    labels = np.arange(lo, hi + 1, dtype="int16")
+    bucket = pd.cut(pct, bins=np.append(labels, hi + 1) - 0.5, labels=labels,
+                    right=False).rename("인상률(%)")
+    sal = df["퇴직"].groupby(bucket, observed=True).mean()*100
+    sal.index = sal.index.astype("int16")
+    return sal
+
+@st.cache_data(hash_funcs=_df_hash)
+def overtime_rate(df):
+    return df.groupby("야근정도", observed=True)["퇴직"].mean()*100
+
+@st.cache_data(hash_funcs=_df_hash)
+def kpis(df):
+    arr = df["퇴직"].to_numpy()
+    quit_n = int(arr.sum())
+    n = arr.size
+    return n, quit_n, quit_n * 100.0 / n